@@ -1,23 +1,51 @@
 """Configuration file for the Sphinx documentation builder."""
 
 from datetime import date
-from os.path import abspath, dirname
+import json
 from pathlib import Path
 import tomllib
 
 INSTITUTE_NAME = "Allen Institute for Neural Dynamics"
 
 current_year = date.today().year
-this_file_path = abspath(__file__)
-project_root = Path(dirname(dirname(dirname(this_file_path))))
+project_root = Path(__file__).resolve().parents[2]
 
 project = "harp-updater-gui"
 project_copyright = f"{current_year}, {INSTITUTE_NAME}"
 author = INSTITUTE_NAME
 
 pyproject_path = project_root / "pyproject.toml"
-pyproject_data = tomllib.loads(pyproject_path.read_text(encoding="utf-8"))
-release = pyproject_data["project"]["version"]
+
+
+def _load_release(pyproject_path):
+    """Read the project version, reusing a cached value while pyproject.toml is unchanged."""
+    stat = pyproject_path.stat()
+    key = f"{stat.st_mtime_ns}:{stat.st_size}"
+    cache_path = project_root / ".doctrees" / "pyproject.cache.json"
+
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            return cached["release"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with pyproject_path.open("rb") as f:
+        pyproject_data = tomllib.load(f)
+    release = pyproject_data["project"]["version"]
+
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"key": key, "release": release}), encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+    return release
+
+
+release = _load_release(pyproject_path)
 
 extensions = [
     "sphinx.ext.duration",
@@ -7,12 +7,13 @@ This script provides a simple way to launch the application.
 
 import sys
 from pathlib import Path
-from harp_updater_gui.main import start_app
 
-# Add src to path if running directly
-src_path = Path(__file__).parent / "src"
-if src_path.exists():
-    sys.path.insert(0, str(src_path))
+try:
+    from harp_updater_gui.main import start_app
+except ImportError:
+    # Fall back to the in-tree sources when the package is not installed
+    sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+    from harp_updater_gui.main import start_app
 
 if __name__ == "__main__":
     start_app()
@@ -1,14 +1,63 @@
-from nicegui import ui, app, run
+from nicegui import ui, app
+from nicegui.events import UploadEventArguments
 from typing import Optional, Callable
 from pathlib import Path
+import asyncio
+import shutil
+import tempfile
 from harp_updater_gui.models.device import Device
 from harp_updater_gui.services.device_manager import DeviceManager
 from harp_updater_gui.services.firmware_service import FirmwareService
 
+# Kind column labels that differ from the device kind itself
+_KIND_LABELS = {"Pico": "PICO", "": "Unknown"}
+
 
 class DeviceTable:
     """Device table component with integrated firmware upload"""
 
+    # Table column definitions, shared by every rendered table
+    _COLUMNS: tuple[dict, ...] = (
+        {
+            "name": "name",
+            "label": "Device Name",
+            "field": "name",
+            "align": "left",
+            "sortable": True,
+        },
+        {
+            "name": "port",
+            "label": "Port",
+            "field": "port",
+            "align": "left",
+            "sortable": True,
+        },
+        {
+            "name": "kind",
+            "label": "Kind",
+            "field": "kind",
+            "align": "left",
+        },
+        {
+            "name": "hardware",
+            "label": "Hardware",
+            "field": "hardware",
+            "align": "left",
+        },
+        {
+            "name": "firmware",
+            "label": "Firmware",
+            "field": "firmware",
+            "align": "left",
+        },
+        {
+            "name": "status",
+            "label": "Status",
+            "field": "status",
+            "align": "left",
+        },
+    )
+
     def __init__(
         self,
         device_manager: DeviceManager,
@@ -33,41 +82,83 @@ class DeviceTable:
         self.force_upload_checkbox = None
         self.batch_update_checkbox = None
         self.file_path_label = None
+        self.firmware_upload = None
+        self.upload_dir: Optional[Path] = None
         self.deploy_button = None
+        self._deploy_button_enabled = False
         self.connect_all_on_refresh_checkbox = None
         self.connect_all_on_refresh = False
         self.refresh_button = None
         self.refresh_dialog = None
         self.is_refreshing = False
+        self._initial_refresh_done = False
 
         # Search and filter state
+        self.search_query = ""
         self.filter_type = "All types"
+        self._pending_update: Optional[asyncio.TimerHandle] = None
+
+        # Row dicts per port, reused while the displayed device fields are unchanged
+        self._row_cache: dict[Optional[str], tuple[tuple, dict]] = {}
+
+        # Device list version and view settings the table rows were built for
+        self._last_update_signature: Optional[tuple] = None
+
+        # Last deploy eligibility result and the state it was computed for
+        self._deploy_cache: Optional[tuple[tuple, tuple[bool, Optional[str]]]] = None
+
+    def _set_deploy_enabled(self, enabled: bool):
+        """Enable or disable the deploy button, skipping no-op updates"""
+        if enabled != self._deploy_button_enabled:
+            self._deploy_button_enabled = enabled
+            self.deploy_button.set_enabled(enabled)
 
     def _get_deploy_eligibility(self) -> tuple[bool, Optional[str]]:
         """Evaluate whether firmware deployment is currently allowed."""
+        key = (
+            self.device_manager.version,
+            self.selected_device is not None,
+            self.selected_device.port_name if self.selected_device else None,
+            bool(self.batch_update_checkbox and self.batch_update_checkbox.value),
+        )
+        if self._deploy_cache is not None and self._deploy_cache[0] == key:
+            return self._deploy_cache[1]
+
+        result = self._evaluate_deploy_eligibility()
+        self._deploy_cache = (key, result)
+        return result
+
+    def _evaluate_deploy_eligibility(self) -> tuple[bool, Optional[str]]:
+        """Check the device list for states that block firmware deployment."""
         devices = self.device_manager.get_devices()
 
         if not devices:
             return False, "No devices available for firmware deployment"
 
-        bootloader_devices = [d for d in devices if d.state == "Bootloader"]
-        error_devices = [
-            d for d in devices if d.state in ("DriverError", "DeviceError")
-        ]
+        bootloader_device = None
+        multiple_bootloaders = False
+        for device in devices:
+            # Never allow deployment when any device is in error state.
+            if device.state in ("DriverError", "DeviceError"):
+                return (
+                    False,
+                    "Deployment blocked: one or more devices are in DeviceError state",
+                )
+            if device.state == "Bootloader":
+                if bootloader_device is None:
+                    bootloader_device = device
+                else:
+                    multiple_bootloaders = True
 
-        # Never allow deployment when any device is in error state.
-        if error_devices:
-            return (
-                False,
-                "Deployment blocked: one or more devices are in DeviceError state",
-            )
+        # If more than one device is in Bootloader, block all deployment.
+        if multiple_bootloaders:
+            return False, "Deployment blocked: multiple devices are in Bootloader state"
 
         # Allow exactly one Bootloader device, but only to that specific device.
-        if len(bootloader_devices) == 1:
+        if bootloader_device is not None:
             if not self.selected_device:
                 return False, "Select the Bootloader device to deploy firmware"
 
-            bootloader_device = bootloader_devices[0]
             if self.selected_device.port_name != bootloader_device.port_name:
                 return False, "Deployment allowed only to the single Bootloader device"
 
@@ -77,12 +168,6 @@ class DeviceTable:
                     "Batch update is not allowed when exactly one device is in Bootloader state",
                 )
 
-            return True, None
-
-        # If more than one device is in Bootloader, block all deployment.
-        if len(bootloader_devices) > 1:
-            return False, "Deployment blocked: multiple devices are in Bootloader state"
-
         return True, None
 
     def render(self):
@@ -93,17 +178,20 @@ class DeviceTable:
                 ui.label("Harp Devices").classes("text-2xl font-bold")
 
                 with ui.row().classes("gap-4"):
-                    # Search input with dynamic filtering
-                    search_input = ui.input(placeholder="Search devices...").classes(
-                        "w-48"
-                    )
+                    # Search input with dynamic filtering (debounced so the
+                    # filter only updates once the user pauses typing)
+                    ui.input(placeholder="Search devices...").props(
+                        "debounce=300 clearable"
+                    ).classes("w-48").bind_value(
+                        self, "search_query"
+                    ).on_value_change(self.on_filter_change)
 
                     # Filter dropdown
                     ui.select(
                         options=["All types", "Pico", "ATxmega", "Healthy", "Error"],
                         value="All types",
                     ).classes("w-36").bind_value(self, "filter_type").on_value_change(
-                        self.update_table
+                        self._schedule_filter_change
                     )
 
                     # Refresh button
@@ -136,51 +224,17 @@ class DeviceTable:
             # Device table
             self.table = (
                 ui.table(
-                    columns=[
-                        {
-                            "name": "name",
-                            "label": "Device Name",
-                            "field": "name",
-                            "align": "left",
-                            "sortable": True,
-                        },
-                        {
-                            "name": "port",
-                            "label": "Port",
-                            "field": "port",
-                            "align": "left",
-                            "sortable": True,
-                        },
-                        {
-                            "name": "kind",
-                            "label": "Kind",
-                            "field": "kind",
-                            "align": "left",
-                        },
-                        {
-                            "name": "hardware",
-                            "label": "Hardware",
-                            "field": "hardware",
-                            "align": "left",
-                        },
-                        {
-                            "name": "firmware",
-                            "label": "Firmware",
-                            "field": "firmware",
-                            "align": "left",
-                        },
-                        {
-                            "name": "status",
-                            "label": "Status",
-                            "field": "status",
-                            "align": "left",
-                        },
-                    ],
+                    columns=list(self._COLUMNS),
                     rows=[],
                     row_key="port",
                     selection="single",
+                    # rowsNumber switches Quasar to server-side pagination:
+                    # only the visible page is sent and sorting/filtering
+                    # happen in update_table
                     pagination={
                         "rowsPerPage": 10,
+                        "page": 1,
+                        "rowsNumber": 0,
                         "sortBy": "name",
                         "descending": False,
                     },
@@ -188,21 +242,29 @@ class DeviceTable:
                 .classes("w-full")
                 .props("flat bordered")
                 .on("selection", self.on_row_select)
+                .on("request", self.on_table_request, ["pagination"])
             )
 
             self.table.add_slot(
                 "body-cell-status",
                 """
                 <q-td :props="props">
-                    <q-badge :color="props.row.status_color">
+                    <q-badge :color="{Healthy: 'positive', Bootloader: 'warning'}[props.value] || 'negative'">
                         {{ props.row.status }}
                     </q-badge>
                 </q-td>
             """,
             )
 
-            # Bind search input to table filter after table is created
-            search_input.bind_value(self.table, "filter")
+            for version_column in ("hardware", "firmware"):
+                self.table.add_slot(
+                    f"body-cell-{version_column}",
+                    """
+                    <q-td :props="props">
+                        v{{ props.value || '?' }}
+                    </q-td>
+                """,
+                )
 
             # Firmware upload section
             with ui.card().classes("w-full p-4 firmware-upload-card"):
@@ -218,6 +280,16 @@ class DeviceTable:
                             self.file_path_label = ui.label("No file selected").classes(
                                 "text-sm text-secondary firmware-file-label"
                             )
+                            # Hidden uploader used as the browser-mode file picker
+                            self.firmware_upload = (
+                                ui.upload(
+                                    on_upload=self._handle_upload,
+                                    auto_upload=True,
+                                    max_files=1,
+                                )
+                                .props('accept=".uf2,.hex"')
+                                .classes("hidden")
+                            )
 
                     with ui.column().classes("firmware-upload-actions"):
                         self.batch_update_checkbox = ui.checkbox(
@@ -233,13 +305,18 @@ class DeviceTable:
                         self.deploy_button = ui.button(
                             "🚀 Deploy Firmware", on_click=self.deploy_firmware
                         ).classes("btn btn-primary firmware-deploy-btn")
-                    self.deploy_button.set_enabled(False)
+                    self.deploy_button.set_enabled(self._deploy_button_enabled)
 
-            # Initial load
-            ui.timer(0.1, self._initial_refresh, once=True)
+            # Initial load once the client is connected
+            ui.context.client.on_connect(self._initial_refresh)
+            ui.context.client.on_delete(self._remove_upload_dir)
 
     async def _initial_refresh(self):
-        """Run initial refresh after UI has mounted."""
+        """Run initial refresh once the client has connected."""
+        # on_connect also fires on reconnects; only the first one loads devices
+        if self._initial_refresh_done:
+            return
+        self._initial_refresh_done = True
         await self.refresh_devices(show_notification=False)
 
     def _set_refreshing(self, refreshing: bool):
@@ -260,16 +337,30 @@ class DeviceTable:
         if self.is_refreshing:
             return
 
+        if self.device_manager.upload_in_progress:
+            # Listing would connect to the ports a deployment is flashing;
+            # show the current device list instead
+            self.update_table()
+            ui.notify(
+                "Firmware update in progress, refresh once it has finished",
+                type="warning",
+            )
+            return
+
         self._set_refreshing(True)
 
         if show_notification:
             ui.notify("Checking for devices...", type="info")
         try:
-            devices = await run.io_bound(
-                self.device_manager.refresh_devices,
-                True,
-                self.connect_all_on_refresh,
+            await self.device_manager.refresh_devices_async(
+                True, self.connect_all_on_refresh
             )
+            devices = self.device_manager.get_devices()
+            # Drop cached rows for devices that are gone
+            ports = {d.port_name for d in devices}
+            for port in self._row_cache.keys() - ports:
+                del self._row_cache[port]
+
             self.update_table()
             if show_notification:
                 ui.notify(f"Found {len(devices)} device(s)", type="positive")
@@ -289,43 +380,103 @@ class DeviceTable:
         else:
             ui.notify("Connect on refresh disabled", type="info")
 
+    def on_filter_change(self):
+        """Show the first page of results when the search or filter changes"""
+        self._pending_update = None
+        self.table.pagination = {**self.table.pagination, "page": 1}
+        self.update_table()
+
+    def _schedule_filter_change(self):
+        """Apply a filter change after a short delay, collapsing rapid changes"""
+        if self._pending_update:
+            self._pending_update.cancel()
+        self._pending_update = asyncio.get_running_loop().call_later(
+            0.25, self.on_filter_change
+        )
+
+    def on_table_request(self, e):
+        """Handle page and sort changes requested by the table"""
+        self.table.pagination = e.args["pagination"]
+        self.update_table()
+
     def update_table(self):
-        """Update the device table with filtered data"""
-        # Only filter by device type since search is handled by table's built-in filter
-        devices = self.device_manager.filter_devices(
-            search_query=None,  # Don't filter by search query - the table handles this
-            device_type=self.filter_type if self.filter_type != "All types" else None,
+        """Update the device table with the current page of filtered data"""
+        # Enable deploy button if firmware is selected
+        if self.firmware_file_path and self.selected_device:
+            self._set_deploy_enabled(True)
+
+        pagination = self.table.pagination
+        rows_per_page = pagination.get("rowsPerPage", 0)
+        page = pagination.get("page", 1)
+
+        # Nothing to rebuild if the device list and the view are unchanged
+        signature = (
+            self.device_manager.version,
+            self.search_query,
+            self.filter_type,
+            page,
+            rows_per_page,
+            pagination.get("sortBy"),
+            pagination.get("descending", False),
         )
+        if signature == self._last_update_signature:
+            return
 
-        rows = []
-        for device in devices:
-            # Map health color to Quasar color
-            status_color = (
-                "positive"
-                if device.health_color == "green"
-                else ("warning" if device.health_color == "yellow" else "negative")
+        def query(page: int):
+            return self.device_manager.query_devices(
+                offset=(page - 1) * rows_per_page,
+                limit=rows_per_page or None,
+                sort_by=pagination.get("sortBy"),
+                descending=pagination.get("descending", False),
+                search_query=self.search_query,
+                device_type=self.filter_type
+                if self.filter_type != "All types"
+                else None,
             )
 
-            rows.append(
-                {
-                    "name": device.display_name,
-                    "port": device.port_name,
-                    "kind": "PICO"
-                    if device.kind == "Pico"
-                    else (device.kind or "Unknown"),
-                    "hardware": f"v{device.hardware_version or '?'}",
-                    "firmware": f"v{device.firmware_version or '?'}",
-                    "status": device.health_status,
-                    "status_color": status_color,
-                }
-            )
+        devices, total = query(page)
 
-        self.table.rows = rows
-        self.table.update()
+        # Step back to the last page if the current one no longer exists
+        if not devices and page > 1 and rows_per_page:
+            page = max(1, -(-total // rows_per_page))
+            devices, total = query(page)
 
-        # Enable deploy button if firmware is selected
-        if self.firmware_file_path and self.selected_device:
-            self.deploy_button.set_enabled(True)
+        # Assigning a prop re-sends the table, so only do it on a real change
+        new_pagination = {**pagination, "page": page, "rowsNumber": total}
+        if new_pagination != pagination:
+            self.table.pagination = new_pagination
+        self._last_update_signature = signature[:3] + (page,) + signature[4:]
+
+        rows = []
+        for device in devices:
+            key = (
+                device.display_name,
+                device.kind,
+                device.state,
+                device.hardware_version,
+                device.firmware_version,
+            )
+            cached = self._row_cache.get(device.port_name)
+            if cached is not None and cached[0] == key:
+                rows.append(cached[1])
+                continue
+
+            # Versions and badge colors are formatted by the cell slots
+            row = {
+                "name": device.display_name,
+                "port": device.port_name,
+                "kind": _KIND_LABELS.get(device.kind, device.kind),
+                "hardware": device.hardware_version,
+                "firmware": device.firmware_version,
+                "status": device.health_status,
+            }
+            self._row_cache[device.port_name] = (key, row)
+            rows.append(row)
+
+        # Only push rows to the client when they actually changed
+        if rows != self.table.rows:
+            self.table.rows = rows
+            self.table.update()
 
     def on_row_select(self, e):
         """Handle row selection"""
@@ -335,17 +486,14 @@ class DeviceTable:
             port_name = selected_row["port"]
 
             # Find the device by port name
-            devices = self.device_manager.get_devices()
-            self.selected_device = next(
-                (d for d in devices if d.port_name == port_name), None
-            )
+            self.selected_device = self.device_manager.get_device_by_port(port_name)
 
             # Enable deploy button if firmware is selected
             if self.firmware_file_path and self.selected_device:
-                self.deploy_button.set_enabled(True)
+                self._set_deploy_enabled(True)
         else:
             self.selected_device = None
-            self.deploy_button.set_enabled(False)
+            self._set_deploy_enabled(False)
 
     async def browse_firmware(self):
         """Open file picker to browse for firmware file"""
@@ -367,43 +515,34 @@ class DeviceTable:
                     self.firmware_file_path = selected_path
                     self.file_path_label.set_text(Path(selected_path).name)
                     if self.selected_device:
-                        self.deploy_button.set_enabled(True)
+                        self._set_deploy_enabled(True)
                     ui.notify(f"Selected: {Path(selected_path).name}", type="info")
                 return
 
         # Browser-based picker fallback
-        try:
-            result = await ui.run_javascript(
-                """
-                new Promise((resolve) => {
-                    const input = document.createElement('input');
-                    input.type = 'file';
-                    input.accept = '.uf2,.hex';
-                    input.onchange = (e) => {
-                        const file = e.target.files[0];
-                        if (file) {
-                            resolve(file.name);
-                        } else {
-                            resolve(null);
-                        }
-                    };
-                    input.click();
-                })
-            """,
-                timeout=60.0,
-            )
-        except TimeoutError:
-            ui.notify(
-                "File picker did not respond in time. Please try again.", type="warning"
-            )
-            return
-
-        if result:
-            self.firmware_file_path = result
-            self.file_path_label.set_text(result)
-            if self.selected_device:
-                self.deploy_button.set_enabled(True)
-            ui.notify(f"Selected: {result}", type="info")
+        self.firmware_upload.run_method("pickFiles")
+
+    async def _handle_upload(self, e: UploadEventArguments):
+        """Store a firmware file picked in browser mode and select it"""
+        if self.upload_dir is None:
+            self.upload_dir = Path(tempfile.mkdtemp(prefix="harp_updater_gui_"))
+
+        file_name = Path(e.file.name).name
+        target_path = self.upload_dir / file_name
+        await e.file.save(target_path)
+        self.firmware_upload.reset()
+
+        self.firmware_file_path = str(target_path)
+        self.file_path_label.set_text(file_name)
+        if self.selected_device:
+            self._set_deploy_enabled(True)
+        ui.notify(f"Selected: {file_name}", type="info")
+
+    def _remove_upload_dir(self):
+        """Delete firmware files uploaded in browser mode"""
+        if self.upload_dir is not None:
+            shutil.rmtree(self.upload_dir, ignore_errors=True)
+            self.upload_dir = None
 
     async def deploy_firmware(self):
         """Deploy firmware to selected device(s)"""
@@ -421,7 +560,7 @@ class DeviceTable:
             return
 
         # Disable button during deployment
-        self.deploy_button.set_enabled(False)
+        self._set_deploy_enabled(False)
 
         try:
             if self.on_deploy:
@@ -438,12 +577,11 @@ class DeviceTable:
 
                 if batch_update:
                     # Find all devices with the same name
-                    all_devices = self.device_manager.get_devices()
-                    devices_to_update = [
-                        d
-                        for d in all_devices
-                        if d.display_name == self.selected_device.display_name
-                    ]
+                    devices_to_update = (
+                        self.device_manager.get_devices_by_display_name(
+                            self.selected_device.display_name
+                        )
+                    )
                     await self.on_deploy(
                         devices_to_update, self.firmware_file_path, force
                     )
@@ -455,7 +593,7 @@ class DeviceTable:
         finally:
             # Re-enable button after deployment
             if self.selected_device and self.firmware_file_path:
-                self.deploy_button.set_enabled(True)
+                self._set_deploy_enabled(True)
                 self.force_upload_checkbox.set_value(
                     False
                 )  # Reset force upload checkbox after operation
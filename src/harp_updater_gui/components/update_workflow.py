@@ -1,6 +1,8 @@
 from nicegui import ui
-from datetime import datetime
+import asyncio
+import time
 from enum import Enum
+from typing import Optional
 
 
 class LogLevel(Enum):
@@ -16,6 +18,13 @@ class LogLevel(Enum):
 class UpdateWorkflow:
     """Update workflow panel component"""
 
+    # Maximum number of blocks kept in the activity log; the cap is on blocks
+    # (one per flushed run of same-level entries), not on lines
+    LOG_MAX_BLOCKS = 500
+
+    # Interval for flushing buffered log entries to the client (seconds)
+    LOG_FLUSH_INTERVAL = 0.05
+
     # Color mapping for log levels (CSS class names)
     LOG_COLORS = {
         LogLevel.INFO: "log-info",
@@ -34,11 +43,25 @@ class UpdateWorkflow:
         LogLevel.DEBUG: "🔍",
     }
 
+    # (prefix, css class) per level, so formatting an entry is one lookup;
+    # colors are looked up by level since comprehensions can't see LOG_COLORS
+    LOG_FORMAT_BY_LEVEL = dict(
+        zip(LOG_PREFIXES, zip(LOG_PREFIXES.values(), map(LOG_COLORS.get, LOG_PREFIXES)))
+    )
+
     def __init__(self):
         """Initialize update workflow component"""
         self.has_error = False
         self.error_message = ""
 
+        # Timestamp of the last log entry, reused for entries in the same second
+        self._last_ts_s = -1
+        self._last_ts_str = ""
+
+        # Log entries waiting to be flushed, as (text, css class) pairs
+        self._pending_logs: list[tuple[str, str]] = []
+        self._log_flush_handle: Optional[asyncio.TimerHandle] = None
+
         # UI elements
         self.log = None
         self.alert_container = None
@@ -50,7 +73,7 @@ class UpdateWorkflow:
             ui.label("Activity Log").classes("workflow-title")
 
             # Log section
-            self.log = ui.log(max_lines=999).classes("activity-log w-full")
+            self.log = ui.log().classes("activity-log w-full")
             self.push_log("Ready to start firmware updates.", LogLevel.INFO)
 
             # Alert container (initially hidden)
@@ -66,8 +89,12 @@ class UpdateWorkflow:
         """
         self.has_error = False
 
-        self.push_log(f"Starting firmware update for {device_name}", LogLevel.INFO)
-        self.push_log(f"Target firmware version: {firmware_version}", LogLevel.INFO)
+        self.push_logs(
+            [
+                (f"Starting firmware update for {device_name}", LogLevel.INFO),
+                (f"Target firmware version: {firmware_version}", LogLevel.INFO),
+            ]
+        )
 
     def start_batch_update(
         self, device_name: str, device_count: int, firmware_version: str
@@ -82,11 +109,15 @@ class UpdateWorkflow:
         """
         self.has_error = False
 
-        self.push_log(
-            f'Starting BATCH firmware update for {device_count} "{device_name}" devices',
-            LogLevel.INFO,
+        self.push_logs(
+            [
+                (
+                    f'Starting BATCH firmware update for {device_count} "{device_name}" devices',
+                    LogLevel.INFO,
+                ),
+                (f"Target firmware version: {firmware_version}", LogLevel.INFO),
+            ]
         )
-        self.push_log(f"Target firmware version: {firmware_version}", LogLevel.INFO)
 
     def push_log(self, message: str, level: LogLevel = LogLevel.INFO):
         """
@@ -96,14 +127,72 @@ class UpdateWorkflow:
             message: Log message text
             level: Log level (INFO, SUCCESS, WARNING, ERROR, DEBUG)
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        prefix = self.LOG_PREFIXES.get(level, "")
-        color_class = self.LOG_COLORS.get(level, "log-info")
-        log_entry = f"[{timestamp}] {prefix} {message}"
-
-        # Update UI with colored log entry
+        # Queue the entry; bursts are sent to the UI in a single flush
         if self.log:
-            self.log.push(log_entry, classes=color_class)
+            self._pending_logs.append(self._format_log(message, level))
+            self._schedule_log_flush()
+
+    def push_logs(self, entries: list[tuple[str, LogLevel]]):
+        """
+        Push several log messages at once
+
+        Args:
+            entries: (message, level) pairs, in display order
+        """
+        if self.log and entries:
+            self._pending_logs.extend(
+                self._format_log(message, level) for message, level in entries
+            )
+            self._schedule_log_flush()
+
+    def _format_log(self, message: str, level: LogLevel) -> tuple[str, str]:
+        """Build the (text, css class) pair for a log entry"""
+        now = time.time()
+        sec = int(now)
+        if sec != self._last_ts_s:
+            self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+            self._last_ts_s = sec
+        prefix, color_class = self.LOG_FORMAT_BY_LEVEL.get(level, ("", "log-info"))
+        return f"[{self._last_ts_str}] {prefix} {message}", color_class
+
+    def _schedule_log_flush(self):
+        """Flush buffered log entries after LOG_FLUSH_INTERVAL, if not already due"""
+        if self._log_flush_handle is None:
+            self._log_flush_handle = asyncio.get_running_loop().call_later(
+                self.LOG_FLUSH_INTERVAL, self._flush_logs
+            )
+
+    def _flush_logs(self):
+        """Push buffered log entries to the log view"""
+        self._log_flush_handle = None
+        pending, self._pending_logs = self._pending_logs, []
+
+        # The page may have been closed while entries were buffered
+        if self.log.is_deleted:
+            return
+
+        # Consecutive entries with the same level are rendered as one
+        # multi-line element rather than one element per line
+        start = 0
+        with self.log:
+            for i in range(1, len(pending) + 1):
+                if i == len(pending) or pending[i][1] != pending[start][1]:
+                    lines = "\n".join(entry for entry, _ in pending[start:i])
+                    ui.label(lines).classes(pending[start][1])
+                    start = i
+
+        # Drop the oldest blocks in one go, sending a single update
+        children = self.log.default_slot.children
+        excess = len(children) - self.LOG_MAX_BLOCKS
+        if excess > 0:
+            dropped = children[:excess]
+            del children[:excess]
+            self.log.client.remove_elements(
+                element
+                for block in dropped
+                for element in block.descendants(include_self=True)
+            )
+            self.log.update()
 
     def show_error(self, error_message: str):
         """
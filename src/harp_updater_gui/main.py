@@ -7,24 +7,29 @@ Built with NiceGUI and integrating with the HarpRegulator CLI tool.
 """
 
 from multiprocessing import freeze_support
+import asyncio
+import functools
+import os
 import sys
 import logging
 import shutil
 from pathlib import Path
-from nicegui import ui, app, run
-from nicegui import core as nicegui_core
-from harp_updater_gui.components.header import Header
-from harp_updater_gui.components.device_table import DeviceTable
-from harp_updater_gui.components.update_workflow import UpdateWorkflow, LogLevel
-from harp_updater_gui.services.device_manager import DeviceManager
-from harp_updater_gui.services.firmware_service import FirmwareService
-from harp_updater_gui.models.device import Device
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
+# NiceGUI and the UI components are imported where they are used so that
+# importing this module (tests, docs, multiprocessing workers) stays cheap.
+if TYPE_CHECKING:
+    from harp_updater_gui.models.device import Device
+    from harp_updater_gui.services.device_manager import DeviceManager
+    from harp_updater_gui.services.firmware_service import FirmwareService
 
+
+@functools.lru_cache(maxsize=1)
 def _resolve_static_dir() -> Optional[Path]:
     """Resolve static directory for both source and frozen (PyInstaller) runs."""
-    candidates = [Path(__file__).resolve().parent / "static"]
+    # __file__ and sys.executable are already absolute, and bundles contain no
+    # symlinks, so the candidates are used without resolve()
+    candidates = [Path(__file__).parent / "static"]
 
     if getattr(sys, "frozen", False):
         meipass = getattr(sys, "_MEIPASS", None)
@@ -37,7 +42,7 @@ def _resolve_static_dir() -> Optional[Path]:
                 ]
             )
 
-        exe_dir = Path(sys.executable).resolve().parent
+        exe_dir = Path(sys.executable).parent
         candidates.extend(
             [
                 exe_dir / "static",
@@ -46,15 +51,55 @@ def _resolve_static_dir() -> Optional[Path]:
             ]
         )
 
+    # is_dir() is False for missing paths, so one stat per candidate is enough
     for candidate in candidates:
-        if candidate.exists() and candidate.is_dir():
+        if candidate.is_dir():
             return candidate
 
     return None
 
 
-STATIC_DIR = _resolve_static_dir()
-_SHARED_CSS_INJECTED = False
+@functools.lru_cache(maxsize=1)
+def _resolve_regulator_path() -> str:
+    """Resolve the HarpRegulator executable for both source and frozen runs."""
+    env_path = os.environ.get("HARP_REGULATOR_EXE")
+    if env_path:
+        return env_path
+
+    regulator_path = shutil.which("HarpRegulator.exe")
+    if regulator_path is None:
+        if getattr(sys, "frozen", False):
+            exe_dir = Path(sys.executable).resolve().parent
+            regulator_path = str(exe_dir / "_internal" / "harp_regulator" / "win-x64" /"HarpRegulator.exe")
+        else:
+            regulator_path = str(Path(__file__).resolve().parent.parent.parent / "deps" / "harp_regulator" / "win-x64" / "HarpRegulator.exe")
+
+    print(f"Resolved HarpRegulator path: {regulator_path}")
+    return regulator_path
+
+
+def _resolve_cache_dir() -> Path:
+    """Per-user cache directory (LOCALAPPDATA on Windows, XDG cache elsewhere)."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    return Path(base or Path.home() / ".cache") / "harp_updater_gui"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_device_manager() -> "DeviceManager":
+    """Return the device manager shared by all sessions."""
+    from harp_updater_gui.services.device_manager import DeviceManager
+
+    return DeviceManager(_resolve_regulator_path())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_firmware_service() -> "FirmwareService":
+    """Return the firmware service shared by all sessions."""
+    from harp_updater_gui.services.firmware_service import FirmwareService
+
+    return FirmwareService(
+        _resolve_regulator_path(), cache_file=str(_resolve_cache_dir() / "inspect.json")
+    )
 
 
 class HarpFirmwareUpdaterApp:
@@ -63,21 +108,11 @@ class HarpFirmwareUpdaterApp:
     def __init__(self):
         """Initialize the application"""
 
-        # Resolve paths to external tools per os depending on source vs frozen execution
-        self.regulator_path = shutil.which("HarpRegulator.exe")
-        if self.regulator_path is None:
-            if getattr(sys, "frozen", False):
-                exe_dir = Path(sys.executable).resolve().parent
-                self.regulator_path = str(exe_dir / "_internal" / "harp_regulator" / "win-x64" /"HarpRegulator.exe")
-            else:
-                self.regulator_path = str(Path(__file__).resolve().parent.parent.parent / "deps" / "harp_regulator" / "win-x64" / "HarpRegulator.exe")
-        
-        print(f"Resolved HarpRegulator path: {self.regulator_path}")
-
+        self.regulator_path = _resolve_regulator_path()
 
-        # Initialize services
-        self.device_manager = DeviceManager(self.regulator_path)
-        self.firmware_service = FirmwareService(self.regulator_path)
+        # Services are shared across sessions
+        self.device_manager = _get_device_manager()
+        self.firmware_service = _get_firmware_service()
 
         # Initialize components (will be set in render)
         self.header = None
@@ -86,7 +121,7 @@ class HarpFirmwareUpdaterApp:
 
 
     async def on_firmware_deploy(
-        self, devices: List[Device], firmware_path: str, force: bool = False
+        self, devices: List["Device"], firmware_path: str, force: bool = False
     ):
         """
         Handle firmware deployment for one or more devices (batch update support)
@@ -96,6 +131,10 @@ class HarpFirmwareUpdaterApp:
             firmware_path: Path to firmware file or version string
             force: Force upload even if checks fail
         """
+        from nicegui import ui
+        from harp_updater_gui.components.update_workflow import LogLevel
+        from harp_updater_gui.models.device import Device
+
         # Handle single device passed as non-list for backwards compatibility
         if isinstance(devices, Device):
             devices = [devices]
@@ -144,96 +183,88 @@ class HarpFirmwareUpdaterApp:
                 f"Validating firmware file: {firmware_path}", LogLevel.INFO
             )
 
-            # Validate using firmware service
-            valid, error_msg = self.firmware_service.validate_firmware_file(
-                devices[0].kind, firmware_path
-            )
-            if not valid:
-                self.update_workflow.push_log(
-                    f"Invalid firmware file: {error_msg}", LogLevel.ERROR
+            # Validate using firmware service, once per device kind in the update
+            for kind in dict.fromkeys(d.kind for d in devices):
+                valid, error_msg = self.firmware_service.validate_firmware_file(
+                    kind, firmware_path
                 )
-                self.update_workflow.show_error(f"Invalid firmware file: {error_msg}")
-                ui.notify("Invalid firmware file", type="negative")
-                return
+                if not valid:
+                    self.update_workflow.push_log(
+                        f"Invalid firmware file: {error_msg}", LogLevel.ERROR
+                    )
+                    self.update_workflow.show_error(
+                        f"Invalid firmware file: {error_msg}"
+                    )
+                    ui.notify("Invalid firmware file", type="negative")
+                    return
 
             self.update_workflow.push_log("Firmware file validated", LogLevel.SUCCESS)
 
-            # Step 1.5: Close any device connections by refreshing without connecting
-            self.update_workflow.push_log(
-                "Closing device connections...", LogLevel.INFO
-            )
-            await run.cpu_bound(
-                self.device_manager.refresh_devices, allow_connect=False
-            )
+            # Device tables skip listing devices (which connects to ports)
+            # until the ports are released and flashed
+            with self.device_manager.uploading():
+                # Step 1.5: Close any device connections by refreshing without connecting
+                self.update_workflow.push_log(
+                    "Closing device connections...", LogLevel.INFO
+                )
+                await self.device_manager.release_ports_async()
+
+                # Wait for OS to release port handles
+                await asyncio.sleep(3)
+
+                # Step 2: Flash firmware to all devices; ATxmega uploads run
+                # concurrently on their own ports, while the device manager flashes
+                # Pico devices one at a time since they share PICOBOOT
+                completed = 0
+
+                def on_flash_done(_task: asyncio.Task) -> None:
+                    nonlocal completed
+                    completed += 1
+                    if is_batch:
+                        upload_label.set_text(
+                            f"Uploading firmware ({completed}/{total_devices} done)..."
+                        )
 
-            # Wait for OS to release port handles
-            await run.io_bound(lambda: __import__("time").sleep(3))
+                tasks = []
+                for idx, device in enumerate(devices, 1):
+                    task = asyncio.create_task(
+                        self._flash_device(
+                            device, firmware_path, force, idx, total_devices
+                        )
+                    )
+                    task.add_done_callback(on_flash_done)
+                    tasks.append(task)
+                results = await asyncio.gather(*tasks, return_exceptions=True)
 
             # Track results for batch updates
             success_count = 0
             fail_count = 0
-
-            # Step 2: Flash firmware to each device
-            for idx, device in enumerate(devices, 1):
-                if is_batch:
-                    upload_label.set_text(
-                        f"Uploading firmware ({idx}/{total_devices})..."
-                    )
+            output = ""
+            for device, result in zip(devices, results):
+                if isinstance(result, Exception):
+                    output = str(result)
                     self.update_workflow.push_log(
-                        f"--- Device {idx}/{total_devices}: {device.display_name} ({device.port_name}) ---",
-                        LogLevel.INFO,
-                    )
-
-                if force:
-                    self.update_workflow.push_log(
-                        f"Starting FORCED firmware upload to {device.display_name}...",
-                        LogLevel.WARNING,
-                    )
-                else:
-                    self.update_workflow.push_log(
-                        f"Starting firmware upload to {device.display_name} ({device.port_name})...",
-                        LogLevel.INFO,
+                        f"Upload failed for {device.display_name}: {output}",
+                        LogLevel.ERROR,
                     )
-
-                # Upload firmware using device manager (run in thread to avoid blocking UI)
-                success, output = await run.cpu_bound(
-                    self.device_manager.upload_firmware_to_device,
-                    device,
-                    firmware_path,
-                    force,
-                )
-
-                if success:
+                    fail_count += 1
+                elif result[0]:
                     success_count += 1
-                    self.update_workflow.push_log(
-                        f"Firmware uploaded successfully to {device.display_name}",
-                        LogLevel.SUCCESS,
-                    )
-
-                    # Wait between devices for batch updates
-                    if is_batch and idx < total_devices:
-                        self.update_workflow.push_log(
-                            "Waiting before next device...", LogLevel.INFO
-                        )
-                        await run.io_bound(lambda: __import__("time").sleep(2))
                 else:
+                    output = result[1]
                     fail_count += 1
-                    self.update_workflow.push_log(
-                        f"Upload failed for {device.display_name}: {output}",
-                        LogLevel.ERROR,
-                    )
 
-                    # For single device, show error dialog
-                    if not is_batch:
-                        if not force:
-                            error_msg = f"Firmware upload failed: {output}"
-                            self.update_workflow.show_error_with_force(error_msg)
-                        else:
-                            self.update_workflow.show_error(
-                                f"Forced firmware upload failed: {output}"
-                            )
-                        ui.notify("Firmware upload failed", type="negative")
-                        return
+            # For single device, show error dialog
+            if not is_batch and fail_count:
+                if not force:
+                    error_msg = f"Firmware upload failed: {output}"
+                    self.update_workflow.show_error_with_force(error_msg)
+                else:
+                    self.update_workflow.show_error(
+                        f"Forced firmware upload failed: {output}"
+                    )
+                ui.notify("Firmware upload failed", type="negative")
+                return
 
             # Step 3: Verify and complete
             if is_batch:
@@ -267,7 +298,7 @@ class HarpFirmwareUpdaterApp:
                 self.update_workflow.push_log(
                     "Waiting for device to reboot...", LogLevel.INFO
                 )
-                await run.io_bound(lambda: __import__("time").sleep(3))
+                await asyncio.sleep(3)
 
                 self.update_workflow.push_log("Firmware verified", LogLevel.SUCCESS)
                 self.update_workflow.complete_update(True)
@@ -285,8 +316,69 @@ class HarpFirmwareUpdaterApp:
             # Close loading dialog
             loading_dialog.close()
 
+    async def _flash_device(
+        self,
+        device: "Device",
+        firmware_path: str,
+        force: bool,
+        idx: int,
+        total_devices: int,
+    ) -> tuple[bool, str]:
+        """
+        Upload firmware to one device and log the outcome
+
+        Args:
+            device: Target device
+            firmware_path: Path to firmware file
+            force: Force upload even if checks fail
+            idx: Position of the device in the update (1-based)
+            total_devices: Number of devices being updated
+
+        Returns:
+            Tuple of (success, message)
+        """
+        from harp_updater_gui.components.update_workflow import LogLevel
+
+        if total_devices > 1:
+            self.update_workflow.push_log(
+                f"--- Device {idx}/{total_devices}: {device.display_name} ({device.port_name}) ---",
+                LogLevel.INFO,
+            )
+
+        if force:
+            self.update_workflow.push_log(
+                f"Starting FORCED firmware upload to {device.display_name}...",
+                LogLevel.WARNING,
+            )
+        else:
+            self.update_workflow.push_log(
+                f"Starting firmware upload to {device.display_name} ({device.port_name})...",
+                LogLevel.INFO,
+            )
+
+        success, output = await self.device_manager.upload_firmware_to_device_async(
+            device, firmware_path, force
+        )
+
+        if success:
+            self.update_workflow.push_log(
+                f"Firmware uploaded successfully to {device.display_name}",
+                LogLevel.SUCCESS,
+            )
+        else:
+            self.update_workflow.push_log(
+                f"Upload failed for {device.display_name}: {output}",
+                LogLevel.ERROR,
+            )
+        return success, output
+
     def render(self):
         """Render the main application UI"""
+        from nicegui import ui
+        from harp_updater_gui.components.header import Header
+        from harp_updater_gui.components.device_table import DeviceTable
+        from harp_updater_gui.components.update_workflow import UpdateWorkflow
+
         # Configure NiceGUI color theme
         ui.colors(
             primary="#2563eb",  # Blue for primary actions
@@ -338,19 +430,22 @@ class HarpFirmwareUpdaterApp:
 
 def start_app():
     """Initialize and start the application."""
-    css_content = None
-    if STATIC_DIR:
-        css_path = STATIC_DIR / "styles.css"
-        if css_path.exists():
-            with open(css_path, "r", encoding="utf-8") as f:
-                css_content = f.read()
+    from nicegui import ui, app
+    from nicegui import core as nicegui_core
+
+    # Add static files directory if present and link the stylesheet from it
+    # so the browser can cache it. Resolved here rather than at import so
+    # multiprocessing workers importing this module skip the lookup.
+    static_dir = _resolve_static_dir()
+    if static_dir:
+        app.add_static_files("/static", str(static_dir))
+        ui.add_head_html(
+            '<link rel="stylesheet" href="/static/styles.css">', shared=True
+        )
+    else:
+        logging.warning("Static assets directory not found; continuing without /static.")
 
     def root() -> None:
-        global _SHARED_CSS_INJECTED
-        if css_content and not _SHARED_CSS_INJECTED:
-            ui.add_head_html(f"<style>{css_content}</style>", shared=True)
-            _SHARED_CSS_INJECTED = True
-
         app_instance = HarpFirmwareUpdaterApp()
         app_instance.render()
 
@@ -378,15 +473,10 @@ def start_app():
         # Clean shutdown on Ctrl+C
         pass
 
-# Add static files directory if present
-if STATIC_DIR:
-    app.add_static_files("/static", str(STATIC_DIR))
-else:
-    logging.warning("Static assets directory not found; continuing without /static.")
 
 # Start the app when executed directly.
 # Do not start on "__mp_main__" because Windows multiprocessing workers
-# (used by run.cpu_bound) import this module under that name.
+# (e.g. NiceGUI's process pool) import this module under that name.
 if __name__ == "__main__":
     freeze_support()  # For PyInstaller compatibility
     start_app()
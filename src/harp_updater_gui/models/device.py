@@ -1,5 +1,10 @@
+from functools import cached_property
 from typing import Optional
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# Health status per device state, and indicator color per health status
+_STATE_TO_HEALTH = {"Online": "Healthy", "Bootloader": "Bootloader", "DriverError": "Error"}
+_HEALTH_TO_COLOR = {"Healthy": "green", "Bootloader": "yellow", "Error": "red"}
 
 
 class Device(BaseModel):
@@ -51,14 +56,12 @@ class Device(BaseModel):
         None, alias="Source", description="Device source identifier"
     )
 
-    model_config = ConfigDict(populate_by_name=True)
-
-    @field_validator("serial_number", mode="before")
-    def serialize_serial_number(cls, value):
-        """Convert serial numbers coming in as ints to strings."""
-        if value is None:
-            return value
-        return str(value)
+    # Frozen so the cached display properties below can never go stale.
+    # Serial numbers reported as ints are converted to strings by pydantic
+    # itself (coerce_numbers_to_str), leaving one Python-level validator.
+    model_config = ConfigDict(
+        populate_by_name=True, frozen=True, coerce_numbers_to_str=True
+    )
 
     @model_validator(mode="after")
     def validate_port_name(self):
@@ -69,7 +72,7 @@ class Device(BaseModel):
             )
         return self
 
-    @property
+    @cached_property
     def display_name(self) -> str:
         """Get a human-readable display name for the device"""
         if self.device_description:
@@ -80,32 +83,17 @@ class Device(BaseModel):
             return f"Device on {self.port_name}"
         return "Unknown Device"
 
-    @property
+    @cached_property
     def health_status(self) -> str:
         """Get health status based on device state and confidence"""
-        if self.state == "Online":
-            return "Healthy"
-        elif self.state == "Bootloader":
-            return "Bootloader"
-        elif self.state == "DriverError":
-            return "Error"
-        else:
-            return "Unknown"
+        return _STATE_TO_HEALTH.get(self.state, "Unknown")
 
-    @property
+    @cached_property
     def health_color(self) -> str:
         """Get color indicator for health status"""
-        status = self.health_status
-        if status == "Healthy":
-            return "green"
-        elif status == "Bootloader":
-            return "yellow"
-        elif status == "Error":
-            return "red"
-        else:
-            return "gray"
+        return _HEALTH_TO_COLOR.get(self.health_status, "gray")
 
-    @property
+    @cached_property
     def metadata_line(self) -> str:
         """Get a formatted metadata line for display"""
         parts = []
@@ -1,7 +1,36 @@
+import asyncio
+import contextlib
 import json
+import locale
 import subprocess
 from typing import List, Dict, Any, Optional
 
+try:
+    # orjson (installed with NiceGUI) parses the CLI's bytes output directly
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Extra subprocess arguments that keep a console window from flashing up on
+# Windows; shared by all wrappers since nothing in them is per-call
+_SUBPROCESS_KWARGS: Dict[str, Any] = {}
+if hasattr(subprocess, "CREATE_NO_WINDOW"):
+    _startupinfo = subprocess.STARTUPINFO()
+    _startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _startupinfo.wShowWindow = 0
+    _SUBPROCESS_KWARGS = {
+        "startupinfo": _startupinfo,
+        "creationflags": subprocess.CREATE_NO_WINDOW,
+    }
+
+
+def _decode(data: bytes) -> str:
+    """Decode process output the way subprocess.run(text=True) does"""
+    return data.decode(locale.getpreferredencoding(False)).replace("\r\n", "\n")
+
 
 class CLIWrapper:
     """Wrapper for HarpRegulator CLI commands"""
@@ -14,28 +43,58 @@ class CLIWrapper:
             cli_path: Path to HarpRegulator executable (default: "HarpRegulator" in PATH)
         """
         self.cli_path = cli_path
-        self._subprocess_kwargs: Dict[str, Any] = {}
-
-        if hasattr(subprocess, "CREATE_NO_WINDOW"):
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0
-            self._subprocess_kwargs = {
-                "startupinfo": startupinfo,
-                "creationflags": subprocess.CREATE_NO_WINDOW,
-            }
-
-    def _run_command(self, cmd: List[str]) -> subprocess.CompletedProcess[str]:
-        """Run CLI command without flashing a console window on Windows."""
+        self._subprocess_kwargs = _SUBPROCESS_KWARGS
+
+    def _run_command(
+        self, cmd: List[str], text: bool = True
+    ) -> subprocess.CompletedProcess:
+        """Run CLI command without flashing a console window on Windows.
+
+        JSON commands pass text=False so their output is parsed as bytes,
+        skipping the decode to str.
+        """
         return subprocess.run(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
+            text=text,
             check=True,
             **self._subprocess_kwargs,
         )
 
+    async def _run_command_async(
+        self, cmd: List[str], text: bool = True
+    ) -> subprocess.CompletedProcess:
+        """Async counterpart of _run_command.
+
+        Falls back to a worker thread on event loops without subprocess
+        support (e.g. the selector loop uvicorn uses on Windows with reload).
+        """
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **self._subprocess_kwargs,
+            )
+        except NotImplementedError:
+            return await asyncio.to_thread(self._run_command, cmd, text)
+
+        try:
+            stdout, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            # Don't leave the CLI running when the caller gives up on it
+            if proc.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    proc.kill()
+            await proc.wait()
+            raise
+        if text:
+            stdout, stderr = _decode(stdout), _decode(stderr)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stdout, stderr)
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
     def list_devices(
         self, all_devices: bool = True, allow_connect: bool = True
     ) -> List[Dict[str, Any]]:
@@ -49,6 +108,30 @@ class CLIWrapper:
         Returns:
             List of device dictionaries with device information
         """
+        try:
+            result = self._run_command(
+                self._list_command(all_devices, allow_connect), text=False
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"Error listing devices: {_decode(e.stderr)}")
+            return []
+        return self._parse_device_list(result.stdout)
+
+    async def list_devices_async(
+        self, all_devices: bool = True, allow_connect: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Async version of list_devices"""
+        try:
+            result = await self._run_command_async(
+                self._list_command(all_devices, allow_connect), text=False
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"Error listing devices: {_decode(e.stderr)}")
+            return []
+        return self._parse_device_list(result.stdout)
+
+    def _list_command(self, all_devices: bool, allow_connect: bool) -> List[str]:
+        """Build the list command line"""
         cmd = [self.cli_path, "list", "--json"]
 
         if all_devices:
@@ -57,17 +140,16 @@ class CLIWrapper:
         if allow_connect:
             cmd.append("--allow-connect")
 
-        try:
-            result = self._run_command(cmd)
+        return cmd
 
-            if result.stdout.strip():
-                devices = json.loads(result.stdout)
+    @staticmethod
+    def _parse_device_list(stdout: bytes) -> List[Dict[str, Any]]:
+        """Parse the JSON output of the list command"""
+        try:
+            if stdout.strip():
+                devices = _json_loads(stdout)
                 return devices if isinstance(devices, list) else []
             return []
-
-        except subprocess.CalledProcessError as e:
-            print(f"Error listing devices: {e.stderr}")
-            return []
         except json.JSONDecodeError as e:
             print(f"Error parsing device list: {e}")
             return []
@@ -85,14 +167,31 @@ class CLIWrapper:
         cmd = [self.cli_path, "inspect", firmware_path, "--json"]
 
         try:
-            result = self._run_command(cmd)
-
-            if result.stdout.strip():
-                return json.loads(result.stdout)
+            result = self._run_command(cmd, text=False)
+        except subprocess.CalledProcessError as e:
+            print(f"Error inspecting firmware: {_decode(e.stderr)}")
             return None
+        return self._parse_firmware_info(result.stdout)
 
+    async def inspect_firmware_async(
+        self, firmware_path: str
+    ) -> Optional[Dict[str, Any]]:
+        """Async version of inspect_firmware"""
+        cmd = [self.cli_path, "inspect", firmware_path, "--json"]
+
+        try:
+            result = await self._run_command_async(cmd, text=False)
         except subprocess.CalledProcessError as e:
-            print(f"Error inspecting firmware: {e.stderr}")
+            print(f"Error inspecting firmware: {_decode(e.stderr)}")
+            return None
+        return self._parse_firmware_info(result.stdout)
+
+    @staticmethod
+    def _parse_firmware_info(stdout: bytes) -> Optional[Dict[str, Any]]:
+        """Parse the JSON output of the inspect command"""
+        try:
+            if stdout.strip():
+                return _json_loads(stdout)
             return None
         except json.JSONDecodeError as e:
             print(f"Error parsing firmware info: {e}")
@@ -122,6 +221,50 @@ class CLIWrapper:
         Returns:
             Tuple of (success: bool, output: str)
         """
+        cmd = self._upload_command(
+            firmware_path, target, force, no_interactive, progress, no_reboot, verbose
+        )
+
+        try:
+            result = self._run_command(cmd)
+            return True, result.stdout
+
+        except subprocess.CalledProcessError as e:
+            return False, e.stderr
+
+    async def upload_firmware_async(
+        self,
+        firmware_path: str,
+        target: str,
+        force: bool = False,
+        no_interactive: bool = True,
+        progress: bool = True,
+        no_reboot: bool = False,
+        verbose: bool = False,
+    ) -> tuple[bool, str]:
+        """Async version of upload_firmware"""
+        cmd = self._upload_command(
+            firmware_path, target, force, no_interactive, progress, no_reboot, verbose
+        )
+
+        try:
+            result = await self._run_command_async(cmd)
+            return True, result.stdout
+
+        except subprocess.CalledProcessError as e:
+            return False, e.stderr
+
+    def _upload_command(
+        self,
+        firmware_path: str,
+        target: str,
+        force: bool,
+        no_interactive: bool,
+        progress: bool,
+        no_reboot: bool,
+        verbose: bool,
+    ) -> List[str]:
+        """Build the upload command line"""
         cmd = [self.cli_path, "upload", firmware_path, "--target", target]
 
         if force:
@@ -141,12 +284,7 @@ class CLIWrapper:
         if verbose:
             cmd.append("--verbose")
 
-        try:
-            result = self._run_command(cmd)
-            return True, result.stdout
-
-        except subprocess.CalledProcessError as e:
-            return False, e.stderr
+        return cmd
 
     def install_drivers(self) -> tuple[bool, str]:
         """
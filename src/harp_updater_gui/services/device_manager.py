@@ -1,11 +1,24 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import contextlib
+import time
 from harp_updater_gui.services.cli_wrapper import CLIWrapper
 from harp_updater_gui.models.device import Device
 
+# Sort keys for the sortable device table columns
+_SORT_KEYS = {
+    "name": lambda d: d.display_name.casefold(),
+    "port": lambda d: d.port_name or "",
+}
+
 
 class DeviceManager:
     """Manager for Harp device operations"""
 
+    # Time a Pico needs after an upload before the next one is rebooted into
+    # BOOTSEL (seconds)
+    PICOBOOT_SETTLE_TIME = 2.0
+
     def __init__(self, cli_path: str = "HarpRegulator"):
         """
         Initialize device manager
@@ -17,6 +30,42 @@ class DeviceManager:
         self.devices: List[Device] = []
         self.selected_device: Optional[Device] = None
 
+        # Incremented whenever the device list is refreshed
+        self.version = 0
+
+        # Lookup tables by port and by display name, rebuilt on refresh
+        self._by_port: Dict[str, Device] = {}
+        self._by_name: Dict[str, List[Device]] = {}
+
+        # Casefolded search text per device, rebuilt on refresh
+        self._search_index: Tuple[Tuple[Device, str], ...] = ()
+
+        # Last search query and its matching index entries; a query that
+        # extends it only needs to scan those matches
+        self._last_search: Tuple[str, Tuple[Tuple[Device, str], ...]] = ("", ())
+
+        # HarpRegulator flashes "the first available PICOBOOT device", so Pico
+        # uploads must never overlap, across all sessions
+        self._picoboot_lock = asyncio.Lock()
+        self._picoboot_ready_at = 0.0
+
+        # Number of firmware deployments in progress, across all sessions
+        self._active_uploads = 0
+
+    @property
+    def upload_in_progress(self) -> bool:
+        """Whether any session is currently deploying firmware"""
+        return self._active_uploads > 0
+
+    @contextlib.contextmanager
+    def uploading(self):
+        """Mark a firmware deployment as in progress for the enclosed block"""
+        self._active_uploads += 1
+        try:
+            yield
+        finally:
+            self._active_uploads -= 1
+
     def refresh_devices(
         self, all_devices: bool = True, allow_connect: bool = True
     ) -> List[Device]:
@@ -33,16 +82,67 @@ class DeviceManager:
         device_data = self.cli.list_devices(
             all_devices=all_devices, allow_connect=allow_connect
         )
+        return self._set_devices(device_data)
+
+    async def refresh_devices_async(
+        self, all_devices: bool = True, allow_connect: bool = True
+    ) -> List[Device]:
+        """Async version of refresh_devices"""
+        device_data = await self.cli.list_devices_async(
+            all_devices=all_devices, allow_connect=allow_connect
+        )
+        return self._set_devices(device_data)
 
-        self.devices = []
+    async def release_ports_async(self):
+        """
+        Close any device connections held by the CLI
+
+        Listing without --allow-connect is what releases the ports; the
+        device list is left alone until the next refresh.
+        """
+        await self.cli.list_devices_async(allow_connect=False)
+
+    def _set_devices(self, device_data: List[Dict]) -> List[Device]:
+        """Parse CLI device data and rebuild the lookup indexes"""
+        devices = []
         for data in device_data:
             try:
                 device = Device(**data)
-                self.devices.append(device)
+                devices.append(device)
             except Exception as e:
                 print(f"Error parsing device data: {e}")
                 print(f"Raw data: {data}")
                 continue
+        self.devices = devices
+
+        self._by_port = {}
+        self._by_name = {}
+        for d in self.devices:
+            if d.port_name is not None:
+                self._by_port[d.port_name] = d
+            self._by_name.setdefault(d.display_name, []).append(d)
+
+        # Versions are indexed as the table shows them ("v1.0", "v?") so the
+        # same terms match as when the table filtered its own cells
+        self._search_index = tuple(
+            (
+                d,
+                "\0".join(
+                    [
+                        d.display_name,
+                        d.port_name or "",
+                        d.device_description or "",
+                        d.kind,
+                        f"v{d.hardware_version or '?'}",
+                        f"v{d.firmware_version or '?'}",
+                        d.health_status,
+                    ]
+                ).casefold(),
+            )
+            for d in self.devices
+        )
+        self._last_search = ("", ())
+        self.version += 1
 
         return self.devices
 
@@ -50,6 +150,14 @@ class DeviceManager:
         """Get the current list of devices"""
         return self.devices
 
+    def get_device_by_port(self, port_name: str) -> Optional[Device]:
+        """Get the device connected on a port, if any"""
+        return self._by_port.get(port_name)
+
+    def get_devices_by_display_name(self, display_name: str) -> List[Device]:
+        """Get all devices with the given display name"""
+        return list(self._by_name.get(display_name, ()))
+
     def select_device(self, device: Device):
         """Select a device for operations"""
         self.selected_device = device
@@ -79,16 +187,14 @@ class DeviceManager:
 
         # Apply search query
         if search_query:
-            query_lower = search_query.lower()
-            filtered = [
-                d
-                for d in filtered
-                if query_lower in d.display_name.lower()
-                or query_lower in d.port_name.lower()
-                or (
-                    d.device_description and query_lower in d.device_description.lower()
-                )
-            ]
+            query = search_query.casefold()
+            last_query, last_matches = self._last_search
+            candidates = (
+                last_matches if last_query and last_query in query else self._search_index
+            )
+            matches = tuple(entry for entry in candidates if query in entry[1])
+            self._last_search = (query, matches)
+            filtered = [d for d, _ in matches]
 
         # Apply device type filter
         if device_type and device_type != "All types":
@@ -113,6 +219,40 @@ class DeviceManager:
 
         return filtered
 
+    def query_devices(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        search_query: str = "",
+        device_type: Optional[str] = None,
+    ) -> Tuple[List[Device], int]:
+        """
+        Get one page of filtered and sorted devices
+
+        Args:
+            offset: Index of the first device to return
+            limit: Maximum number of devices to return (None for all)
+            sort_by: Table column to sort by ("name" or "port")
+            descending: Sort in descending order
+            search_query: Text to search in device fields
+            device_type: Filter by device kind or status
+
+        Returns:
+            Tuple of (devices on the page, total number of matching devices)
+        """
+        filtered = self.filter_devices(
+            search_query=search_query, device_type=device_type
+        )
+
+        sort_key = _SORT_KEYS.get(sort_by)
+        if sort_key:
+            filtered = sorted(filtered, key=sort_key, reverse=descending)
+
+        end = offset + limit if limit else None
+        return filtered[offset:end], len(filtered)
+
     def upload_firmware_to_device(
         self, device: Device, firmware_path: str, force: bool = False
     ) -> tuple[bool, str]:
@@ -127,15 +267,47 @@ class DeviceManager:
         Returns:
             Tuple of (success, message)
         """
-        target = device.port_name
+        success, output = self.cli.upload_firmware(
+            firmware_path=firmware_path,
+            target=self._upload_target(device),
+            force=force,
+            no_interactive=True,
+            progress=False,
+            verbose=force,
+        )
 
-        # Use PICOBOOT if device is in bootloader state and is Pico
-        if device.state == "Bootloader" and device.kind == "Pico":
-            target = "PICOBOOT"
+        return success, output
 
-        success, output = self.cli.upload_firmware(
+    async def upload_firmware_to_device_async(
+        self, device: Device, firmware_path: str, force: bool = False
+    ) -> tuple[bool, str]:
+        """
+        Async version of upload_firmware_to_device
+
+        ATxmega uploads run concurrently. Pico uploads run one at a time, with
+        PICOBOOT_SETTLE_TIME between consecutive uploads.
+        """
+        if device.kind != "Pico":
+            return await self._upload_async(device, firmware_path, force)
+
+        async with self._picoboot_lock:
+            wait = self._picoboot_ready_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await self._upload_async(device, firmware_path, force)
+            finally:
+                self._picoboot_ready_at = (
+                    time.monotonic() + self.PICOBOOT_SETTLE_TIME
+                )
+
+    async def _upload_async(
+        self, device: Device, firmware_path: str, force: bool
+    ) -> tuple[bool, str]:
+        """Run the CLI upload for a device"""
+        success, output = await self.cli.upload_firmware_async(
             firmware_path=firmware_path,
-            target=target,
+            target=self._upload_target(device),
             force=force,
             no_interactive=True,
             progress=False,
@@ -143,3 +315,11 @@ class DeviceManager:
         )
 
         return success, output
+
+    @staticmethod
+    def _upload_target(device: Device) -> str:
+        """Get the CLI upload target for a device"""
+        # Use PICOBOOT if device is in bootloader state and is Pico
+        if device.state == "Bootloader" and device.kind == "Pico":
+            return "PICOBOOT"
+        return device.port_name
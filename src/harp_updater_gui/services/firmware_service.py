@@ -1,22 +1,87 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Mapping, Sequence, Tuple
 from pathlib import Path
+import functools
+import json
+import os
+import stat
+import time
+from types import MappingProxyType
 from harp_updater_gui.services.cli_wrapper import CLIWrapper
 # from harp_updater_gui.models.firmware import Firmware
 # from harp_updater_gui.models.device import Device
 
+# Firmware file extensions accepted by each device kind
+_DEVICE_EXT: Mapping[str, frozenset] = MappingProxyType(
+    {
+        "Pico": frozenset({".uf2"}),
+        "ATxmega": frozenset({".hex"}),
+    }
+)
+
+# Every firmware file extension the service knows about
+_FIRMWARE_EXT = frozenset().union(*_DEVICE_EXT.values())
+
 
 class FirmwareService:
     """Service for firmware operations"""
 
-    def __init__(self, cli_path: str = "HarpRegulator"):
+    __slots__ = ("_versions_cache", "cache_file", "cli", "firmware_cache")
+
+    # Maximum number of inspect results kept in the persisted cache
+    CACHE_LIMIT = 64
+
+    # How long available firmware versions are reused before re-querying (seconds)
+    VERSIONS_CACHE_TTL = 300.0
+
+    def __init__(
+        self, cli_path: str = "HarpRegulator", cache_file: Optional[str] = None
+    ):
         """
         Initialize firmware service
 
         Args:
             cli_path: Path to HarpRegulator executable
+            cache_file: JSON file used to keep inspect results across runs
+                (in-memory only if None)
         """
         self.cli = CLIWrapper(cli_path)
-        self.firmware_cache: Dict[str, Dict[str, Any]] = {}
+        self.cache_file = Path(cache_file) if cache_file else None
+
+        # Inspect results keyed by "<path>:<mtime_ns>:<size>", so a file that
+        # changes on disk is inspected again
+        self.firmware_cache: Dict[str, Dict[str, Any]] = self._load_cache()
+
+        # Available firmware versions per device type, with the time fetched
+        self._versions_cache: Dict[str, Tuple[float, Tuple[str, ...]]] = {}
+
+    def clear_caches(self):
+        """Drop in-memory inspect results and available version lists"""
+        self.firmware_cache.clear()
+        self._versions_cache.clear()
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load persisted inspect results, if any"""
+        if self.cache_file is None:
+            return {}
+        try:
+            cache = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_cache(self):
+        """Write the most recent inspect results to the cache file"""
+        if self.cache_file is None:
+            return
+        entries = list(self.firmware_cache.items())[-self.CACHE_LIMIT :]
+        tmp_path = self.cache_file.with_suffix(".tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(dict(entries), f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"Could not write firmware cache: {e}")
 
     def inspect_firmware(self, firmware_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -28,18 +93,72 @@ class FirmwareService:
         Returns:
             Dictionary with firmware information or None on error
         """
+        key = self._cache_key(firmware_path)
+        if key is None:
+            return None
+
         # Check cache first
-        if firmware_path in self.firmware_cache:
-            return self.firmware_cache[firmware_path]
+        if key in self.firmware_cache:
+            return self.firmware_cache[key]
 
         firmware_info = self.cli.inspect_firmware(firmware_path)
 
         if firmware_info:
-            self.firmware_cache[firmware_path] = firmware_info
+            self.firmware_cache[key] = firmware_info
+            self._save_cache()
 
         return firmware_info
 
-    def get_firmware_type(self, firmware_path: str) -> Optional[str]:
+    def inspect_firmwares(
+        self, firmware_paths: Sequence[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Inspect several firmware files, e.g. the contents of a folder
+
+        Each distinct file not already cached is inspected once, and the
+        cache file is written once at the end instead of after every file.
+
+        Args:
+            firmware_paths: Paths to firmware files (.uf2 or .hex)
+
+        Returns:
+            Dictionary mapping each path to its firmware information, or None
+            on error
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        added = False
+        for firmware_path in firmware_paths:
+            if firmware_path in results:
+                continue
+            key = self._cache_key(firmware_path)
+            if key is None:
+                results[firmware_path] = None
+                continue
+
+            firmware_info = self.firmware_cache.get(key)
+            if firmware_info is None:
+                firmware_info = self.cli.inspect_firmware(firmware_path)
+                if firmware_info:
+                    self.firmware_cache[key] = firmware_info
+                    added = True
+            results[firmware_path] = firmware_info
+
+        if added:
+            self._save_cache()
+        return results
+
+    @staticmethod
+    def _cache_key(firmware_path: str) -> Optional[str]:
+        """Inspect cache key for a file, or None if it cannot be stat'd"""
+        try:
+            st = os.stat(firmware_path)
+        except OSError:
+            return None
+        return f"{os.path.abspath(firmware_path)}:{st.st_mtime_ns}:{st.st_size}"
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def get_firmware_type(firmware_path: str) -> Optional[str]:
         """
         Get the firmware file type (UF2 for Pico, HEX for ATxmega)
 
@@ -49,13 +168,8 @@ class FirmwareService:
         Returns:
             File extension (.uf2 or .hex) or None
         """
-        path = Path(firmware_path)
-        ext = path.suffix.lower()
-
-        if ext in [".uf2", ".hex"]:
-            return ext
-
-        return None
+        ext = os.path.splitext(firmware_path)[1].lower()
+        return ext if ext in _FIRMWARE_EXT else None
 
     def is_compatible(
         self, firmware_info: Dict[str, Any], hardware_version: str
@@ -74,18 +188,34 @@ class FirmwareService:
         # For now, return True as a placeholder
         return True
 
-    def get_available_firmware_versions(self, device_type: str) -> List[str]:
+    def get_available_firmware_versions(self, device_type: str) -> Tuple[str, ...]:
         """
         Get available firmware versions for a device type
 
-        This is a placeholder - in a real implementation, this would
-        query a firmware repository or local directory
+        Results are reused for VERSIONS_CACHE_TTL seconds per device type.
 
         Args:
             device_type: Device type (e.g., "EnvironmentSensor")
 
         Returns:
-            List of available firmware version strings
+            Tuple of available firmware version strings; immutable, so the
+            cached result is shared rather than copied
+        """
+        now = time.monotonic()
+        cached = self._versions_cache.get(device_type)
+        if cached is not None and now - cached[0] < self.VERSIONS_CACHE_TTL:
+            return cached[1]
+
+        versions = tuple(self._query_firmware_versions(device_type))
+        self._versions_cache[device_type] = (now, versions)
+        return versions
+
+    def _query_firmware_versions(self, device_type: str) -> List[str]:
+        """
+        Query the available firmware versions for a device type
+
+        This is a placeholder - in a real implementation, this would
+        query a firmware repository or local directory
         """
         # Placeholder implementation
         return ["v0.9.1", "v0.9.0", "v0.5.0"]
@@ -124,29 +254,49 @@ class FirmwareService:
         Returns:
             True if file is valid
         """
-        path = Path(firmware_path)
-
-        if not path.exists():
+        try:
+            st = os.stat(firmware_path)
+        except OSError:
             return False, "Firmware file does not exist"
 
+        if not stat.S_ISREG(st.st_mode):
+            return False, "Firmware path is not a file"
+
         ext = self.get_firmware_type(firmware_path)
-        if ext not in [".uf2", ".hex"]:
+        if ext is None:
             return False, "Unsupported firmware file type"
-        
-        if device_kind not in ["Pico", "ATxmega"]:
+
+        allowed = _DEVICE_EXT.get(device_kind)
+        if allowed is None:
             return False, "Unknown device kind"
 
         # Check compatibility based on device kind
-        if device_kind == "Pico" and ext != ".uf2":
-            return False, "Pico devices require .uf2 firmware files"
-
-        if device_kind == "ATxmega" and ext != ".hex":
-            return False, "ATxmega devices require .hex firmware files"
+        if ext not in allowed:
+            return False, (
+                f"{device_kind} devices require "
+                f"{'/'.join(sorted(allowed))} firmware files"
+            )
 
         # Could add more validation here (e.g., file size, magic bytes)
         return True, ""
 
-    def fetch_available_firmware(self, device_id: str) -> List[str]:
+    def validate_firmware_file_ok(self, device_kind: str, firmware_path: str) -> bool:
+        """
+        Check a firmware file like validate_firmware_file, without the message
+
+        Args:
+            device_kind: Kind of device (e.g., "Pico" or "ATxmega")
+            firmware_path: Path to firmware file
+
+        Returns:
+            True if file is valid
+        """
+        ext = self.get_firmware_type(firmware_path)
+        return ext in _DEVICE_EXT.get(device_kind, ()) and os.path.isfile(
+            firmware_path
+        )
+
+    def fetch_available_firmware(self, device_id: str) -> Tuple[str, ...]:
         """
         Fetch available firmware versions for a device
 
@@ -154,7 +304,7 @@ class FirmwareService:
             device_id: Device identifier
 
         Returns:
-            List of available firmware versions
+            Tuple of available firmware versions (shared, immutable)
         """
         return self.get_available_firmware_versions(device_id)
 
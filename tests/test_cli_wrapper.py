@@ -0,0 +1,98 @@
+import asyncio
+import subprocess
+import sys
+import pytest
+from harp_updater_gui.services.cli_wrapper import CLIWrapper
+
+
+@pytest.fixture
+def cli_wrapper():
+    """Create a CLI wrapper instance for testing"""
+    return CLIWrapper(sys.executable)
+
+
+def python_cmd(code: str) -> list[str]:
+    """Command that runs a short Python snippet"""
+    return [sys.executable, "-c", code]
+
+
+@pytest.mark.asyncio
+async def test_run_command_async(cli_wrapper):
+    """Test async commands return decoded output with normalized newlines"""
+    result = await cli_wrapper._run_command_async(
+        python_cmd("import sys; sys.stdout.buffer.write(b'a\\r\\nb')")
+    )
+
+    assert result.returncode == 0
+    assert result.stdout == "a\nb"
+
+    raw = await cli_wrapper._run_command_async(
+        python_cmd("import sys; sys.stdout.buffer.write(b'a\\r\\nb')"), text=False
+    )
+    assert raw.stdout == b"a\r\nb"
+
+
+@pytest.mark.asyncio
+async def test_run_command_async_failure(cli_wrapper):
+    """Test a non-zero exit raises CalledProcessError with the output"""
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        await cli_wrapper._run_command_async(
+            python_cmd("import sys; sys.stderr.write('bad'); sys.exit(3)")
+        )
+
+    assert exc_info.value.returncode == 3
+    assert exc_info.value.stderr == "bad"
+
+
+@pytest.mark.asyncio
+async def test_run_command_async_thread_fallback(cli_wrapper, mocker):
+    """Test loops without subprocess support fall back to a worker thread"""
+    mocker.patch(
+        "harp_updater_gui.services.cli_wrapper.asyncio.create_subprocess_exec",
+        side_effect=NotImplementedError,
+    )
+    run = mocker.spy(cli_wrapper, "_run_command")
+
+    result = await cli_wrapper._run_command_async(python_cmd("print('ok')"))
+
+    assert result.stdout.strip() == "ok"
+    run.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_run_command_async_cancel_kills_process(cli_wrapper, mocker):
+    """Test cancelling the awaiting task does not leave the process running"""
+    processes = []
+    create = asyncio.create_subprocess_exec
+
+    async def track(*args, **kwargs):
+        proc = await create(*args, **kwargs)
+        processes.append(proc)
+        return proc
+
+    mocker.patch(
+        "harp_updater_gui.services.cli_wrapper.asyncio.create_subprocess_exec",
+        track,
+    )
+
+    task = asyncio.create_task(
+        cli_wrapper._run_command_async(python_cmd("import time; time.sleep(30)"))
+    )
+    while not processes:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert processes[0].returncode is not None
+
+
+@pytest.mark.asyncio
+async def test_list_devices_async_error(cli_wrapper, capsys):
+    """Test a failing listing reports the decoded stderr and returns no devices"""
+    # The Python interpreter rejects HarpRegulator's arguments with an error
+    assert await cli_wrapper.list_devices_async() == []
+
+    out = capsys.readouterr().out
+    assert out.startswith("Error listing devices: ")
+    assert "\r\n" not in out
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from harp_updater_gui.services.device_manager import DeviceManager
 from harp_updater_gui.models.device import Device
@@ -38,6 +39,20 @@ def test_device_model_creation(sample_device_data):
     assert device.state == "Online"
 
 
+def test_device_model_validation(sample_device_data):
+    """Test serial number coercion and the port name requirement"""
+    device = Device(**{**sample_device_data, "SerialNumber": 1234})
+    assert device.serial_number == "1234"
+
+    with pytest.raises(ValueError):
+        Device(**{**sample_device_data, "PortName": None})
+
+    bootloader = Device(
+        **{**sample_device_data, "State": "Bootloader", "PortName": None}
+    )
+    assert bootloader.port_name is None
+
+
 def test_device_display_name(sample_device_data):
     """Test device display name property"""
     device = Device(**sample_device_data)
@@ -103,6 +118,141 @@ def test_filter_devices(device_manager, mocker, sample_device_data):
     assert filtered[0].kind == "ATxmega"
 
 
+def test_filter_devices_search_without_port(
+    device_manager, mocker, sample_device_data
+):
+    """Test search over devices that have no port name"""
+    mock_list = [
+        sample_device_data,
+        {
+            **sample_device_data,
+            "State": "Bootloader",
+            "PortName": None,
+            "DeviceDescription": None,
+        },
+    ]
+    mocker.patch.object(device_manager.cli, "list_devices", return_value=mock_list)
+
+    device_manager.refresh_devices()
+
+    filtered = device_manager.filter_devices(search_query="com5")
+    assert len(filtered) == 1
+    assert filtered[0].port_name == "COM5"
+
+    filtered = device_manager.filter_devices(search_query="device 1405")
+    assert len(filtered) == 1
+    assert filtered[0].port_name is None
+
+
+def test_filter_devices_refined_search(device_manager, mocker, sample_device_data):
+    """Test that narrowing and widening a search gives the full result set"""
+    mock_list = [
+        sample_device_data,
+        {**sample_device_data, "PortName": "COM6", "DeviceDescription": "Environment"},
+        {**sample_device_data, "PortName": "COM7", "DeviceDescription": "Behavior"},
+    ]
+    mocker.patch.object(device_manager.cli, "list_devices", return_value=mock_list)
+
+    device_manager.refresh_devices()
+
+    assert len(device_manager.filter_devices(search_query="env")) == 2
+    assert len(device_manager.filter_devices(search_query="envirosensor")) == 0
+    assert len(device_manager.filter_devices(search_query="environmentsensor")) == 1
+    assert len(device_manager.filter_devices(search_query="e")) == 3
+
+    # A refresh invalidates the previous search results
+    mocker.patch.object(
+        device_manager.cli, "list_devices", return_value=mock_list[1:]
+    )
+    device_manager.refresh_devices()
+    assert len(device_manager.filter_devices(search_query="env")) == 1
+
+
+@pytest.fixture
+def versioned_device_data(sample_device_data):
+    """Two devices with different firmware and hardware versions"""
+    return [
+        sample_device_data,
+        {
+            **sample_device_data,
+            "PortName": "COM6",
+            "FirmwareVersion": "1.3.0",
+            "HardwareVersion": "2.1",
+        },
+    ]
+
+
+def test_filter_devices_by_firmware_version(
+    device_manager, mocker, versioned_device_data
+):
+    """Test that searches match firmware versions with or without the "v" prefix"""
+    mocker.patch.object(
+        device_manager.cli, "list_devices", return_value=versioned_device_data
+    )
+    device_manager.refresh_devices()
+
+    assert [d.port_name for d in device_manager.filter_devices("v0.2")] == ["COM5"]
+    assert [d.port_name for d in device_manager.filter_devices("1.3.0")] == ["COM6"]
+
+
+def test_filter_devices_by_hardware_version(
+    device_manager, mocker, versioned_device_data
+):
+    """Test that searches match hardware versions as the table displays them"""
+    mocker.patch.object(
+        device_manager.cli, "list_devices", return_value=versioned_device_data
+    )
+    device_manager.refresh_devices()
+
+    assert [d.port_name for d in device_manager.filter_devices("v2.1")] == ["COM6"]
+    assert [d.port_name for d in device_manager.filter_devices("v1.0")] == ["COM5"]
+
+
+def test_device_lookups(device_manager, mocker, sample_device_data):
+    """Test looking up devices by port and by display name"""
+    mock_list = [
+        sample_device_data,
+        {**sample_device_data, "PortName": "COM6"},
+        {**sample_device_data, "PortName": "COM7", "DeviceDescription": "Behavior"},
+    ]
+    mocker.patch.object(device_manager.cli, "list_devices", return_value=mock_list)
+
+    device_manager.refresh_devices()
+
+    assert device_manager.get_device_by_port("COM6").port_name == "COM6"
+    assert device_manager.get_device_by_port("COM9") is None
+
+    same_name = device_manager.get_devices_by_display_name("EnvironmentSensor")
+    assert [d.port_name for d in same_name] == ["COM5", "COM6"]
+    assert device_manager.get_devices_by_display_name("Unknown") == []
+
+
+def test_query_devices(device_manager, mocker, sample_device_data):
+    """Test paginated and sorted device queries"""
+    mock_list = [
+        {**sample_device_data, "PortName": f"COM{i}", "DeviceDescription": name}
+        for i, name in enumerate(["Olfactometer", "Behavior", "SoundCard"], 3)
+    ]
+    mocker.patch.object(device_manager.cli, "list_devices", return_value=mock_list)
+
+    device_manager.refresh_devices()
+
+    page, total = device_manager.query_devices(offset=0, limit=2, sort_by="name")
+    assert total == 3
+    assert [d.display_name for d in page] == ["Behavior", "Olfactometer"]
+
+    page, total = device_manager.query_devices(offset=2, limit=2, sort_by="name")
+    assert total == 3
+    assert [d.display_name for d in page] == ["SoundCard"]
+
+    page, total = device_manager.query_devices(sort_by="port", descending=True)
+    assert [d.port_name for d in page] == ["COM5", "COM4", "COM3"]
+
+    page, total = device_manager.query_devices(search_query="sound")
+    assert total == 1
+    assert page[0].port_name == "COM5"
+
+
 def test_select_device(device_manager, mocker, sample_device_data):
     """Test device selection"""
     mocker.patch.object(
@@ -113,6 +263,7 @@ def test_select_device(device_manager, mocker, sample_device_data):
     devices = device_manager.get_devices()
 
     assert len(devices) == 1
+    assert device_manager.version == 1
 
     device_manager.select_device(devices[0])
     selected = device_manager.get_selected_device()
@@ -120,3 +271,111 @@ def test_select_device(device_manager, mocker, sample_device_data):
     assert selected is not None
     assert selected.port_name == "COM5"
     assert selected.display_name == "EnvironmentSensor"
+
+
+@pytest.mark.asyncio
+async def test_refresh_devices_async(device_manager, mocker, sample_device_data):
+    """Test async refresh builds the same device list and indexes"""
+    mocker.patch.object(
+        device_manager.cli,
+        "list_devices_async",
+        mocker.AsyncMock(return_value=[sample_device_data, {"Kind": "Pico"}]),
+    )
+
+    devices = await device_manager.refresh_devices_async()
+
+    # The invalid entry is skipped
+    assert [d.port_name for d in devices] == ["COM5"]
+    assert device_manager.get_device_by_port("COM5") is devices[0]
+    assert device_manager.version == 1
+
+
+@pytest.mark.asyncio
+async def test_release_ports_async(device_manager, mocker, sample_device_data):
+    """Test releasing ports lists without connecting and keeps the device list"""
+    mocker.patch.object(
+        device_manager.cli, "list_devices", return_value=[sample_device_data]
+    )
+    device_manager.refresh_devices()
+    list_async = mocker.patch.object(
+        device_manager.cli, "list_devices_async", mocker.AsyncMock(return_value=[])
+    )
+
+    await device_manager.release_ports_async()
+
+    list_async.assert_awaited_once_with(allow_connect=False)
+    assert len(device_manager.get_devices()) == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_firmware_to_device_async(
+    device_manager, mocker, sample_device_data
+):
+    """Test async upload targets PICOBOOT for Pico devices in bootloader"""
+    upload = mocker.patch.object(
+        device_manager.cli,
+        "upload_firmware_async",
+        mocker.AsyncMock(return_value=(True, "done")),
+    )
+
+    device_manager.PICOBOOT_SETTLE_TIME = 0
+
+    device = Device(**sample_device_data)
+    assert await device_manager.upload_firmware_to_device_async(
+        device, "fw.uf2"
+    ) == (True, "done")
+    assert upload.call_args.kwargs["target"] == "COM5"
+
+    bootloader = Device(**{**sample_device_data, "State": "Bootloader"})
+    await device_manager.upload_firmware_to_device_async(bootloader, "fw.uf2")
+    assert upload.call_args.kwargs["target"] == "PICOBOOT"
+
+
+@pytest.mark.asyncio
+async def test_pico_uploads_do_not_overlap(
+    device_manager, mocker, sample_device_data
+):
+    """Test Pico uploads run one at a time while ATxmega uploads overlap"""
+    device_manager.PICOBOOT_SETTLE_TIME = 0
+    running = []
+    overlaps = []
+
+    async def fake_upload(**kwargs):
+        running.append(kwargs["target"])
+        overlaps.append(tuple(running))
+        await asyncio.sleep(0.01)
+        running.remove(kwargs["target"])
+        return True, "done"
+
+    mocker.patch.object(device_manager.cli, "upload_firmware_async", fake_upload)
+
+    picos = [
+        Device(**{**sample_device_data, "PortName": port}) for port in ("COM5", "COM6")
+    ]
+    await asyncio.gather(
+        *(device_manager.upload_firmware_to_device_async(d, "fw.uf2") for d in picos)
+    )
+    assert max(len(o) for o in overlaps) == 1
+
+    overlaps.clear()
+    atxmegas = [
+        Device(**{**sample_device_data, "Kind": "ATxmega", "PortName": port})
+        for port in ("COM7", "COM8")
+    ]
+    await asyncio.gather(
+        *(
+            device_manager.upload_firmware_to_device_async(d, "fw.hex")
+            for d in atxmegas
+        )
+    )
+    assert max(len(o) for o in overlaps) == 2
+
+
+def test_uploading_tracks_deployments(device_manager):
+    """Test upload_in_progress stays set until every deployment has finished"""
+    assert not device_manager.upload_in_progress
+    with device_manager.uploading():
+        with device_manager.uploading():
+            assert device_manager.upload_in_progress
+        assert device_manager.upload_in_progress
+    assert not device_manager.upload_in_progress
@@ -1,61 +1,96 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 from harp_updater_gui.services.firmware_service import FirmwareService
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def firmware_service():
-    """Create a firmware service instance for testing"""
+    """Create a firmware service instance shared by the read-only tests"""
     return FirmwareService()
 
 
-def test_get_firmware_type(firmware_service):
-    """Test firmware type detection"""
-    assert firmware_service.get_firmware_type("firmware.uf2") == ".uf2"
-    assert firmware_service.get_firmware_type("firmware.hex") == ".hex"
-    assert firmware_service.get_firmware_type("firmware.bin") is None
-    assert firmware_service.get_firmware_type("FIRMWARE.UF2") == ".uf2"
+@pytest.fixture
+def fresh_firmware_service():
+    """Create a firmware service instance for tests that fill its cache"""
+    return FirmwareService()
 
 
-def test_validate_firmware_file(firmware_service, tmp_path):
+@pytest.fixture(autouse=True)
+def mock_cli(firmware_service):
+    """Replace the HarpRegulator CLI so no test spawns a subprocess"""
+    cli = MagicMock()
+    cli.inspect_firmware.return_value = {"WhoAmI": 1405, "Version": "1.0.0"}
+    # Services created during the test get the same mock as the shared one
+    with patch(
+        "harp_updater_gui.services.firmware_service.CLIWrapper", return_value=cli
+    ), patch.object(firmware_service, "cli", cli):
+        yield cli
+
+
+@pytest.fixture(scope="session")
+def firmware_files(tmp_path_factory):
+    """Directory with firmware files shared by the validation cases"""
+    directory = tmp_path_factory.mktemp("firmware")
+    (directory / "test.uf2").write_text("test content")
+    (directory / "test.bin").write_text("test")
+    (directory / "folder.uf2").mkdir()
+    return directory
+
+
+@pytest.mark.parametrize(
+    "file_name, expected",
+    [
+        ("firmware.uf2", ".uf2"),
+        ("firmware.hex", ".hex"),
+        ("firmware.bin", None),
+        ("FIRMWARE.UF2", ".uf2"),
+    ],
+)
+def test_get_firmware_type(firmware_service, file_name, expected):
+    """Test firmware type detection"""
+    assert firmware_service.get_firmware_type(file_name) == expected
+
+
+@pytest.mark.parametrize(
+    "device_kind, file_name, expected",
+    [
+        ("Pico", "test.uf2", True),
+        # Missing file
+        ("Pico", "nonexistent.uf2", False),
+        # Directory with a firmware extension
+        ("Pico", "folder.uf2", False),
+        # Wrong device kind
+        ("UnknownDevice", "test.uf2", False),
+        ("ATxmega", "test.uf2", False),
+        # Invalid extension
+        ("Pico", "test.bin", False),
+    ],
+)
+def test_validate_firmware_file(
+    firmware_service, firmware_files, device_kind, file_name, expected
+):
     """Test firmware file validation"""
-    # Create a test file
-    test_file = tmp_path / "test.uf2"
-    test_file.write_text("test content")
-
-    device_kind = "Pico"
-
-    assert (
-        firmware_service.validate_firmware_file(device_kind, str(test_file))[0] is True
-    )
-    assert (
-        firmware_service.validate_firmware_file(
-            device_kind, str(tmp_path / "nonexistent.uf2")
-        )[0]
-        is False
-    )
+    firmware_path = str(firmware_files / file_name)
 
-    # Test wrong device kind
-    assert (
-        firmware_service.validate_firmware_file("UnknownDevice", str(test_file))[0]
-        is False
-    )
     assert (
-        firmware_service.validate_firmware_file("ATxmega", str(test_file))[0] is False
+        firmware_service.validate_firmware_file_ok(device_kind, firmware_path)
+        is expected
     )
 
-    # Test invalid extension
-    bad_file = tmp_path / "test.bin"
-    bad_file.write_text("test")
-    assert (
-        firmware_service.validate_firmware_file(device_kind, str(bad_file))[0] is False
+    valid, error_msg = firmware_service.validate_firmware_file(
+        device_kind, firmware_path
     )
+    assert valid is expected
+    assert bool(error_msg) is not expected
 
 
+@pytest.mark.slow
 def test_get_available_firmware_versions(firmware_service):
     """Test fetching available firmware versions"""
     versions = firmware_service.get_available_firmware_versions("EnvironmentSensor")
 
-    assert isinstance(versions, list)
+    assert isinstance(versions, tuple)
     assert len(versions) > 0
 
 
@@ -68,33 +103,108 @@ def test_is_compatible(firmware_service):
     assert firmware_service.is_compatible(firmware_info, hardware_version) is True
 
 
-def test_inspect_firmware_cache(firmware_service, mocker):
+def test_inspect_firmware_cache(fresh_firmware_service, tmp_path):
     """Test firmware inspection with caching"""
+    firmware_service = fresh_firmware_service
     mock_info = {"WhoAmI": 1405, "Version": "1.0.0"}
-    mocker.patch.object(
-        firmware_service.cli, "inspect_firmware", return_value=mock_info
-    )
-
-    firmware_path = "test_firmware.uf2"
-
-    # First call should hit the CLI
-    info1 = firmware_service.inspect_firmware(firmware_path)
-    assert info1 == mock_info
-
-    # Second call should use cache
-    info2 = firmware_service.inspect_firmware(firmware_path)
-    assert info2 == mock_info
-
-    # CLI should only be called once
-    firmware_service.cli.inspect_firmware.assert_called_once()
 
+    firmware_file = tmp_path / "test_firmware.uf2"
+    firmware_file.write_text("test content")
+    firmware_path = str(firmware_file)
 
+    with patch.object(
+        firmware_service.cli, "inspect_firmware", return_value=mock_info
+    ) as inspect:
+        # First call should hit the CLI
+        info1 = firmware_service.inspect_firmware(firmware_path)
+        assert info1 == mock_info
+
+        # Second call should use cache
+        info2 = firmware_service.inspect_firmware(firmware_path)
+        assert info2 == mock_info
+
+        # CLI should only be called once
+        inspect.assert_called_once_with(firmware_path)
+
+        # Changing the file invalidates the cached result
+        firmware_file.write_text("new test content")
+        firmware_service.inspect_firmware(firmware_path)
+        assert inspect.call_count == 2
+
+
+def test_inspect_firmware_persistent_cache(mock_cli, tmp_path):
+    """Test inspect results are reused across service instances"""
+    mock_info = mock_cli.inspect_firmware.return_value
+    firmware_file = tmp_path / "test_firmware.uf2"
+    firmware_file.write_text("test content")
+    cache_file = tmp_path / "cache" / "inspect.json"
+
+    first = FirmwareService(cache_file=str(cache_file))
+    assert first.inspect_firmware(str(firmware_file)) == mock_info
+    assert cache_file.exists()
+
+    second = FirmwareService(cache_file=str(cache_file))
+    assert second.inspect_firmware(str(firmware_file)) == mock_info
+    mock_cli.inspect_firmware.assert_called_once()
+
+
+def test_inspect_firmwares_bulk(fresh_firmware_service, mock_cli, tmp_path):
+    """Test bulk inspection reuses the cache and saves it once"""
+    firmware_service = fresh_firmware_service
+    mock_info = mock_cli.inspect_firmware.return_value
+    paths = []
+    for name in ("a.uf2", "b.uf2", "c.hex"):
+        firmware_file = tmp_path / name
+        firmware_file.write_text(name)
+        paths.append(str(firmware_file))
+    missing = str(tmp_path / "missing.uf2")
+
+    with patch.object(FirmwareService, "_save_cache") as save:
+        results = firmware_service.inspect_firmwares(paths + [paths[0], missing])
+        assert results == {**dict.fromkeys(paths, mock_info), missing: None}
+        assert mock_cli.inspect_firmware.call_count == 3
+        save.assert_called_once()
+
+        # Everything is cached now, so nothing is inspected or saved again
+        firmware_service.inspect_firmwares(paths)
+        assert mock_cli.inspect_firmware.call_count == 3
+        save.assert_called_once()
+
+
+def test_available_firmware_versions_cache(fresh_firmware_service):
+    """Test available versions are reused until the TTL expires"""
+    firmware_service = fresh_firmware_service
+    with patch.object(
+        FirmwareService, "_query_firmware_versions", return_value=["v1.0.0"]
+    ) as query, patch(
+        "harp_updater_gui.services.firmware_service.time"
+    ) as clock:
+        clock.monotonic.return_value = 1000.0
+
+        versions = firmware_service.fetch_available_firmware("EnvironmentSensor")
+        assert versions == ("v1.0.0",)
+        assert (
+            firmware_service.get_available_firmware_versions("EnvironmentSensor")
+            is versions
+        )
+        query.assert_called_once()
+
+        clock.monotonic.return_value += firmware_service.VERSIONS_CACHE_TTL
+        firmware_service.get_available_firmware_versions("EnvironmentSensor")
+        assert query.call_count == 2
+
+        firmware_service.clear_caches()
+        firmware_service.get_available_firmware_versions("EnvironmentSensor")
+        assert query.call_count == 3
+
+
+@pytest.mark.slow
 def test_fetch_available_firmware(firmware_service):
     """Test fetching available firmware for a device"""
     device_id = "EnvironmentSensor"
     firmware_list = firmware_service.fetch_available_firmware(device_id)
 
-    assert isinstance(firmware_list, list)
+    assert isinstance(firmware_list, tuple)
 
 
 def test_check_firmware_compatibility(firmware_service):